@@ -1,10 +1,11 @@
 import streamlit as st
-import yfinance as yf
-import ccxt
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import plotly.graph_objects as go
+from disk_cache import disk_cached
+
+# Price data is reused across sessions for this many seconds
+PRICE_TTL = 30 * 60
 
 # Function to calculate RSI
 def calculate_rsi(data, period=14):
@@ -16,7 +17,9 @@ def calculate_rsi(data, period=14):
     return rsi
 
 # Get stock data
+@disk_cached("stock_prices", PRICE_TTL)
 def get_stock_data(symbol, interval, days):
+    import yfinance as yf
     ticker = yf.Ticker(symbol)
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
@@ -27,6 +30,7 @@ def get_stock_data(symbol, interval, days):
 
 # Get crypto data
 def get_crypto_data(symbol, interval, days, df=pd.DataFrame([], columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])):
+    import ccxt
     df_c = df.copy()
     
     timeframe_map = {'1m': '1m', '5m': '5m', '15m': '15m', '30m': '30m', '1h': '1h', '4h': '4h', '1d': '1d', '1w': '1w'}
@@ -78,8 +82,12 @@ def get_crypto_data(symbol, interval, days, df=pd.DataFrame([], columns=['timest
         print(f"Error with {exchange_id}: {str(e)}")
         return df_c
 
+# Cached crypto data; get_crypto_data itself recurses with a partial frame, so it is wrapped rather than decorated
+load_crypto_data = disk_cached("crypto_ohlcv", PRICE_TTL, keep=lambda df: not df.empty)(get_crypto_data)
+
 # Plot RSI
 def plot_rsi(prices, rsi):
+    import plotly.graph_objects as go
     fig = go.Figure()
     
     # Price plot
@@ -105,7 +113,7 @@ def main():
     st.title("RSI Calculator and Visualizer")
     
     # User inputs
-    symbol = st.text_input("Enter Symbol (e.g., AAPL for stock, XRP for crypto)", "AAPL")
+    symbol = st.text_input("Enter Symbol (e.g., AAPL for stock, XRP for crypto)", "AAPL").strip().upper()
     asset_type = st.selectbox("Asset Type", ["Stock", "Crypto"])
     interval = st.selectbox("Price Frequency", 
                             ['1m', '5m', '15m', '30m', '1h', '4h', '1d', '1w'] if asset_type == "Crypto" else ["1d"])
@@ -117,7 +125,7 @@ def main():
         if asset_type == "Stock":
             prices = get_stock_data(symbol, interval, days)
         else:
-            prices = get_crypto_data(symbol, interval, days)
+            prices = load_crypto_data(symbol, interval, days)
         
         if prices is None or prices.empty:
             st.error("Could not fetch data. Please check the symbol and try again.")
@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+from disk_cache import CACHE_DIR
+
+# Cold-start benchmark: imports each app module in a fresh interpreter and records
+# the import time and peak resident memory, so startup regressions show up before workers scale.
+#   python benchmark_startup.py                 # 5 runs per module
+#   python benchmark_startup.py --record        # also append the results to the history file
+
+APP_MODULES = ["stockAIAgent", "stock_analyzer", "RSI_calculator"]
+
+# Baseline row: a process that only loads streamlit, which every app needs anyway
+BASELINE_MODULE = "streamlit"
+
+HISTORY_PATH = os.path.join(CACHE_DIR, "startup_bench.jsonl")
+
+# Runs in the child process; prints import seconds and peak RSS in MB as JSON
+PROBE = """
+import sys, time, json, resource
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+print(json.dumps({{"seconds": elapsed, "rss_mb": rss_mb}}))
+"""
+
+# Import one module in a new interpreter and return its timing
+def measure_import(module):
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-c", PROBE.format(module=module)],
+                            cwd=here, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+# Median import time and peak RSS over several cold runs
+def benchmark_module(module, runs):
+    samples = [measure_import(module) for _ in range(runs)]
+    return {
+        "module": module,
+        "median_seconds": statistics.median(s["seconds"] for s in samples),
+        "max_seconds": max(s["seconds"] for s in samples),
+        "median_rss_mb": statistics.median(s["rss_mb"] for s in samples),
+    }
+
+def load_history():
+    try:
+        with open(HISTORY_PATH) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time and memory of the apps.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (default: 5)")
+    parser.add_argument("--modules", default=",".join(APP_MODULES), help="Comma-separated modules to measure")
+    parser.add_argument("--record", action="store_true", help="Append the results to the history file")
+    args = parser.parse_args()
+
+    modules = [BASELINE_MODULE] + [m.strip() for m in args.modules.split(",") if m.strip()]
+    history = load_history()
+    previous = history[-1]["results"] if history else {}
+
+    results = {}
+    print(f"{'module':<16}{'median s':>10}{'max s':>10}{'RSS MB':>10}{'vs last':>10}")
+    for module in modules:
+        try:
+            row = benchmark_module(module, args.runs)
+        except Exception as e:
+            print(f"{module:<16}failed: {str(e)}")
+            continue
+        results[module] = row
+        change = ""
+        if module in previous:
+            change = f"{row['median_seconds'] - previous[module]['median_seconds']:+.3f}"
+        print(f"{module:<16}{row['median_seconds']:>10.3f}{row['max_seconds']:>10.3f}{row['median_rss_mb']:>10.1f}{change:>10}")
+
+    if args.record and results:
+        os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+        with open(HISTORY_PATH, "a") as f:
+            f.write(json.dumps({"recorded_at": datetime.now().isoformat(timespec="seconds"),
+                                "python": sys.version.split()[0], "results": results}) + "\n")
+        print(f"Recorded in {HISTORY_PATH}")
+
+if __name__ == "__main__":
+    main()
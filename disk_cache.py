@@ -0,0 +1,80 @@
+import os
+import time
+import threading
+import pickle
+import hashlib
+import functools
+
+# Root folder for locally persisted caches, shared by every app process
+CACHE_DIR = os.environ.get("AGENTS_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+
+# Build a stable cache key from any number of text parts
+def cache_key(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def _cache_path(namespace, key):
+    return os.path.join(CACHE_DIR, namespace, f"{key}.pkl")
+
+def _load(namespace, key):
+    try:
+        with open(_cache_path(namespace, key), "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        return None
+
+# Seconds since the entry was saved, or None if there is no entry
+def cache_age(namespace, key):
+    entry = _load(namespace, key)
+    return None if entry is None else time.time() - entry[0]
+
+# Return the cached value, or None if it is missing or older than ttl seconds
+def read_cache(namespace, key, ttl):
+    entry = _load(namespace, key)
+    if entry is None or time.time() - entry[0] > ttl:
+        return None
+    return entry[1]
+
+# Write text or bytes through a temporary file, so readers never see a partial file
+def atomic_write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmpPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmpPath, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+    os.replace(tmpPath, path)
+
+# Persist a value
+def write_cache(namespace, key, value):
+    atomic_write(_cache_path(namespace, key), pickle.dumps((time.time(), value)))
+
+# Decorator that keeps a function's results on disk for ttl seconds, keyed by its arguments,
+# so every app process (and the prefetch worker) shares them.
+# Results that are None or rejected by keep (e.g. error results) are never stored.
+# The wrapper also gets refresh(*args), which always fetches and stores, and age(*args).
+def disk_cached(namespace, ttl, keep=None):
+    def decorator(func):
+        def key_for(*args, **kwargs):
+            return cache_key(*args, *sorted(kwargs.items()))
+
+        def refresh(*args, **kwargs):
+            value = func(*args, **kwargs)
+            if value is not None and (keep is None or keep(value)):
+                write_cache(namespace, key_for(*args, **kwargs), value)
+            return value
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            value = read_cache(namespace, key_for(*args, **kwargs), ttl)
+            if value is not None:
+                return value
+            return refresh(*args, **kwargs)
+
+        wrapper.refresh = refresh
+        wrapper.age = lambda *args, **kwargs: cache_age(namespace, key_for(*args, **kwargs))
+        wrapper.ttl = ttl
+        wrapper.keep = keep
+        return wrapper
+    return decorator
@@ -0,0 +1,185 @@
+import time
+import math
+import pandas as pd
+import numpy as np
+
+# Metrics in the order they are kept when the token budget gets tight
+DIGEST_METRICS = ["Total Revenue", "Net Income", "EBITDA", "Gross Profit", "EBIT", "MarketCap",
+                  "Stockholders Equity", "Company value perception", "Research And Development",
+                  "Ordinary Shares", "Total Debt", "Total Assets", "Dividend Yield"]
+
+# Default prompt budget for a single company digest
+DIGEST_TOKEN_BUDGET = 300
+
+# Rough token count (about 4 characters per token for English and numbers)
+def estimate_tokens(text):
+    return math.ceil(len(text) / 4)
+
+# Short number format: 1.23B, 45.6M, 0.12
+def compact_number(value):
+    for limit, suffix in [(1e12, "T"), (1e9, "B"), (1e6, "M"), (1e3, "K")]:
+        if abs(value) >= limit:
+            return f"{value / limit:.2f}{suffix}"
+    return f"{value:.2f}"
+
+# Turn a get_financials metric (Series, list or 'N/A') into a clean ascending numeric series
+def to_series(values, index=None):
+    if isinstance(values, str):
+        return pd.Series(dtype=float)
+    series = values.copy() if isinstance(values, pd.Series) else pd.Series(list(values))
+    if index is not None and not isinstance(values, pd.Series) and len(index) == len(series):
+        series.index = index
+    series = pd.to_numeric(series, errors="coerce").replace([np.inf, -np.inf], np.nan).dropna()
+    if isinstance(series.index, pd.DatetimeIndex):
+        series = series.sort_index()
+    return series
+
+# Latest value, CAGR, min/max and trend sign for one metric series
+def summarize_series(series):
+    first, last = series.iloc[0], series.iloc[-1]
+    if isinstance(series.index, pd.DatetimeIndex):
+        years = (series.index[-1] - series.index[0]).days / 365.25
+    else:
+        years = len(series) - 1
+    cagr = (last / first) ** (1 / years) - 1 if years > 0 and first > 0 and last > 0 else None
+    trend = "+" if last > first else "-" if last < first else "="
+    return {"latest": last, "cagr": cagr, "min": series.min(), "max": series.max(), "trend": trend}
+
+# Latest-period ratios between metrics, using the most recent date they share
+def key_ratios(series):
+    pairs = {
+        "gross margin": ("Gross Profit", "Total Revenue"),
+        "net margin": ("Net Income", "Total Revenue"),
+        "EBITDA margin": ("EBITDA", "Total Revenue"),
+        "R&D/revenue": ("Research And Development", "Total Revenue"),
+        "debt/assets": ("Total Debt", "Total Assets"),
+        "P/B": ("MarketCap", "Stockholders Equity"),
+    }
+    ratios = {}
+    for name, (top, bottom) in pairs.items():
+        if top not in series or bottom not in series:
+            continue
+        joined = pd.concat([series[top], series[bottom]], axis=1, join="inner").dropna()
+        if joined.empty or joined.iloc[-1, 1] == 0:
+            continue
+        ratios[name] = joined.iloc[-1, 0] / joined.iloc[-1, 1]
+    return ratios
+
+# Key ratios straight from the get_financials output
+def financial_ratios(financials, index=None):
+    series = {metric: to_series(values, index) for metric, values in financials.items()}
+    return key_ratios({metric: s for metric, s in series.items() if len(s) > 0})
+
+# Build a compact text digest of the get_financials output that fits in token_budget
+# index is used for list-valued metrics (e.g. MarketCap) that carry no dates of their own
+def build_digest(company_name, financials, index=None, token_budget=DIGEST_TOKEN_BUDGET):
+    series = {}
+    for metric, values in financials.items():
+        s = to_series(values, index)
+        if len(s) > 0:
+            series[metric] = s
+
+    def fits(candidate):
+        return estimate_tokens("\n".join(candidate)) <= token_budget
+
+    # Every line, including the header and ratios, counts against the budget
+    periods = max((len(s) for s in series.values()), default=0)
+    header = f"{company_name} ({periods} periods; latest, CAGR, min..max, trend)"
+    if not fits([header]):
+        return header[:token_budget * 4]
+    lines = [header]
+
+    ratioItems = []
+    for name, value in key_ratios(series).items():
+        if not fits(lines + ["Ratios: " + ", ".join(ratioItems + [f"{name} {value:.2f}"])]):
+            break
+        ratioItems.append(f"{name} {value:.2f}")
+    if ratioItems:
+        lines.append("Ratios: " + ", ".join(ratioItems))
+
+    ordered = [m for m in DIGEST_METRICS if m in series] + [m for m in series if m not in DIGEST_METRICS]
+    for metric in ordered:
+        summary = summarize_series(series[metric])
+        cagr = f"{summary['cagr'] * 100:+.1f}%" if summary["cagr"] is not None else "n/a"
+        line = (f"{metric}: {compact_number(summary['latest'])}, {cagr}, "
+                f"{compact_number(summary['min'])}..{compact_number(summary['max'])}, {summary['trend']}")
+        if not fits(lines + [line]):
+            break
+        lines.append(line)
+
+    return "\n".join(lines)
+
+# What the prompt would carry if the raw financials dict were pasted in
+def naive_serialization(company_name, financials):
+    return f"{company_name}\n{financials}"
+
+# Combine several digests so many tickers are analyzed in one request
+def build_batch_prompt(digests):
+    sections = "\n\n".join(f"[{i + 1}] {digest}" for i, digest in enumerate(digests))
+    return ("Analyze the financial health, future prospects, and challenges for each company below. "
+            "Answer with one section per company, in the same order.\n\n" + sections)
+
+# Prompt-size savings of a digest against the naive serialization
+def digest_report(company_name, financials, digest):
+    naiveTokens = estimate_tokens(naive_serialization(company_name, financials))
+    digestTokens = estimate_tokens(digest)
+    return {
+        "naive_tokens": naiveTokens,
+        "digest_tokens": digestTokens,
+        "saved_tokens": naiveTokens - digestTokens,
+        "saved_percent": 100 * (naiveTokens - digestTokens) / naiveTokens if naiveTokens else 0.0,
+    }
+
+# Time a one-token completion for each prompt; with output capped, the difference is the prompt-processing cost
+# llm is any object with the OpenAI chat.completions.create interface
+def measure_prompt_latency(llm, prompts, model="gpt-4"):
+    timings = {}
+    for name, prompt in prompts.items():
+        start = time.perf_counter()
+        llm.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=1
+        )
+        timings[name] = time.perf_counter() - start
+    return timings
+
+# Report prompt-size and latency savings of the digest against the naive serialization for real tickers:
+#   python financial_digest.py AAPL MSFT KO
+# Uses stockAIAgent's get_financials and OpenAI client (OPENAI_API_KEY in .streamlit/secrets.toml).
+def main():
+    import argparse
+    import statistics
+    from stockAIAgent import get_financials, get_client, financials_index, insights_prompt
+
+    parser = argparse.ArgumentParser(description="Compare digest prompts with the raw financial data.")
+    parser.add_argument("tickers", nargs="+", help="Ticker symbols")
+    parser.add_argument("--runs", type=int, default=3, help="Timed completions per prompt (default: 3)")
+    parser.add_argument("--budget", type=int, default=DIGEST_TOKEN_BUDGET, help=f"Digest token budget (default: {DIGEST_TOKEN_BUDGET})")
+    args = parser.parse_args()
+
+    llm = get_client()
+    digests = []
+    for ticker in args.tickers:
+        financials, _, _, companyName = get_financials(ticker.upper())
+        if financials is None:
+            print(f"{ticker}: {companyName}")
+            continue
+        digest = build_digest(companyName, financials, financials_index(financials), args.budget)
+        digests.append(digest)
+        prompts = {"naive": insights_prompt(companyName, naive_serialization(companyName, financials)),
+                   "digest": insights_prompt(companyName, digest)}
+        runs = [measure_prompt_latency(llm, prompts) for _ in range(args.runs)]
+        naiveSeconds = statistics.median(run["naive"] for run in runs)
+        digestSeconds = statistics.median(run["digest"] for run in runs)
+        report = digest_report(companyName, financials, digest)
+        print(f"{ticker}: {report['naive_tokens']} -> {report['digest_tokens']} tokens ({report['saved_percent']:.0f}% smaller), "
+              f"latency {naiveSeconds:.2f}s -> {digestSeconds:.2f}s ({naiveSeconds - digestSeconds:+.2f}s saved)")
+
+    if len(digests) > 1:
+        batchSeconds = statistics.median(measure_prompt_latency(llm, {"batch": build_batch_prompt(digests)})["batch"]
+                                         for _ in range(args.runs))
+        print(f"Batch of {len(digests)}: {estimate_tokens(build_batch_prompt(digests))} tokens, {batchSeconds:.2f}s in one request")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+import os
+import sys
+import json
+import math
+import time
+import types
+import random
+import zlib
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Load-test harness: drives many simulated sessions through the Streamlit apps (via streamlit's AppTest)
+# with local stand-ins for yfinance, ccxt and OpenAI, and reports throughput, page latency percentiles,
+# CPU and memory per session.
+#   python load_test.py --app stock_analyzer --sessions 200 --concurrency 20 --latency 0.2
+#   python load_test.py --app all --json results.json
+
+APPS = ["stock_analyzer", "RSI_calculator", "stockAIAgent"]
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Realistic ticker mix: a few names take most of the traffic
+STOCK_MIX = {"AAPL": 14, "MSFT": 12, "NVDA": 12, "TSLA": 10, "AMZN": 9, "GOOGL": 8, "META": 7, "JPM": 5,
+             "AMD": 5, "NFLX": 4, "KO": 3, "XOM": 3, "DIS": 3, "INTC": 2, "BA": 2, "PFE": 1}
+CRYPTO_MIX = {"BTC": 40, "ETH": 30, "XRP": 12, "SOL": 10, "DOGE": 8}
+CRYPTO_INTERVALS = {"1h": 50, "4h": 20, "1d": 20, "15m": 10}
+SECTORS = [("Technology", "Consumer Electronics"), ("Technology", "Semiconductors"), ("Technology", "Software"),
+           ("Communication Services", "Internet Content"), ("Consumer Cyclical", "Auto Manufacturers"),
+           ("Financial Services", "Banks"), ("Energy", "Oil & Gas"), ("Healthcare", "Drug Manufacturers")]
+
+def weighted_choice(rng, mix):
+    return rng.choices(list(mix), weights=list(mix.values()))[0]
+
+# Upstream latency for the stand-ins: base seconds with +/- jitter fraction
+class Latency:
+    def __init__(self, base, jitter):
+        self.base = base
+        self.jitter = jitter
+
+    def wait(self, scale=1.0):
+        if self.base > 0:
+            time.sleep(scale * self.base * (1 + random.uniform(-self.jitter, self.jitter)))
+
+def ticker_rng(symbol):
+    return random.Random(zlib.crc32(symbol.encode("utf-8")))
+
+# ---- yfinance stand-in ----
+
+def fake_price_history(symbol):
+    import pandas as pd
+    import numpy as np
+    rng = ticker_rng(symbol)
+    index = pd.bdate_range(end=datetime.now().date(), periods=6 * 252)
+    returns = np.array([rng.gauss(0.0004, 0.02) for _ in range(len(index))])
+    return pd.Series(rng.uniform(20, 400) * np.exp(np.cumsum(returns)), index=index)
+
+class FakeTicker:
+    def __init__(self, symbol, latency):
+        import pandas as pd
+        self.symbol = symbol.upper()
+        self.latency = latency
+        rng = ticker_rng(self.symbol)
+        self._prices = fake_price_history(self.symbol)
+        self._dates = pd.to_datetime([f"{datetime.now().year - i}-09-30" for i in range(1, 5)])
+        revenue = [rng.uniform(1e10, 4e11)]
+        for _ in range(3):
+            revenue.append(revenue[-1] / rng.uniform(0.9, 1.2))
+        self._revenue = revenue
+        self._rng = rng
+
+    def _rows(self, rows):
+        import pandas as pd
+        return pd.DataFrame.from_dict(rows, orient="index", columns=self._dates)
+
+    @property
+    def financials(self):
+        self.latency.wait()
+        r, rng = self._revenue, self._rng
+        gross = [v * rng.uniform(0.3, 0.6) for v in r]
+        ebitda = [v * rng.uniform(0.2, 0.4) for v in r]
+        ebit = [v * rng.uniform(0.6, 0.9) for v in ebitda]
+        rows = {"Total Revenue": r, "Gross Profit": gross, "EBITDA": ebitda, "EBIT": ebit,
+                "Net Income": [v * rng.uniform(0.6, 0.8) for v in ebit],
+                "Research And Development": [v * rng.uniform(0.02, 0.15) for v in r]}
+        return self._rows(rows)
+
+    @property
+    def balance_sheet(self):
+        self.latency.wait()
+        r, rng = self._revenue, self._rng
+        assets = [v * rng.uniform(0.8, 1.5) for v in r]
+        rows = {"Ordinary Shares Number": [rng.uniform(1e9, 1.6e10)] * 4,
+                "Stockholders Equity": [v * rng.uniform(0.2, 0.5) for v in assets],
+                "Total Debt": [v * rng.uniform(0.1, 0.4) for v in assets],
+                "Total Assets": assets}
+        return self._rows(rows)
+
+    @property
+    def dividends(self):
+        import pandas as pd
+        self.latency.wait(0.5)
+        dates = pd.date_range(end=datetime.now(), periods=20, freq="QS")
+        return pd.Series([self._rng.uniform(0.1, 1.0)] * len(dates), index=dates)
+
+    @property
+    def info(self):
+        self.latency.wait()
+        sector, industry = SECTORS[zlib.crc32(self.symbol.encode("utf-8")) % len(SECTORS)]
+        officers = [{"name": f"{self.symbol} Executive {i + 1}", "title": title} for i, title in enumerate(["CEO", "CFO", "COO"])]
+        return {"longName": f"{self.symbol} Corporation", "sector": sector, "industry": industry, "companyOfficers": officers}
+
+    def history(self, period=None, start=None, end=None, interval="1d"):
+        import pandas as pd
+        self.latency.wait(0.5)
+        prices = self._prices
+        if period is not None:
+            prices = prices[prices.index >= prices.index[-1] - pd.DateOffset(years=int(period.rstrip("y")))]
+        else:
+            prices = prices[(prices.index >= pd.Timestamp(start).normalize()) & (prices.index <= pd.Timestamp(end))]
+        return pd.DataFrame({"Open": prices, "High": prices, "Low": prices, "Close": prices, "Volume": 1e6})
+
+def make_fake_yfinance(latency):
+    module = types.ModuleType("yfinance")
+    module.Ticker = lambda symbol: FakeTicker(symbol, latency)
+    return module
+
+# ---- ccxt stand-in ----
+
+TIMEFRAME_MS = {"1m": 60_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000, "1h": 3_600_000,
+                "4h": 14_400_000, "1d": 86_400_000, "1w": 604_800_000}
+
+def make_fake_ccxt(latency):
+    class FakeExchange:
+        symbols = [f"{symbol}/USDT" for symbol in CRYPTO_MIX]
+
+        def load_markets(self):
+            latency.wait()
+            return {symbol: {} for symbol in self.symbols}
+
+        def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=100):
+            latency.wait()
+            rng = ticker_rng(symbol)
+            step = TIMEFRAME_MS[timeframe]
+            price = rng.uniform(0.1, 60000)
+            rows = []
+            for i in range(int(limit)):
+                price *= math.exp(rng.gauss(0, 0.01))
+                rows.append([since + i * step, price, price * 1.01, price * 0.99, price, rng.uniform(1, 1000)])
+            return rows
+
+    module = types.ModuleType("ccxt")
+    module.kucoin = FakeExchange
+    return module
+
+# ---- OpenAI stand-in ----
+
+def make_fake_openai(latency, token_latency, tokens):
+    def chunk(text):
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=text))])
+
+    def stream():
+        for i in range(tokens):
+            time.sleep(token_latency)
+            yield chunk(f"token{i} ")
+
+    def create(model=None, messages=None, **kwargs):
+        latency.wait(2.0)
+        if kwargs.get("stream"):
+            return stream()
+        time.sleep(token_latency * min(tokens, kwargs.get("max_tokens") or tokens))
+        text = " ".join(f"token{i}" for i in range(tokens))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=text))])
+
+    class OpenAI:
+        def __init__(self, api_key=None, **kwargs):
+            self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=create))
+
+    module = types.ModuleType("openai")
+    module.OpenAI = OpenAI
+    return module
+
+# News API stand-in: stockAIAgent's pooled session goes through requests.Session.get
+def patch_news(latency):
+    import requests
+
+    class FakeResponse:
+        def __init__(self, query):
+            self.query = query
+
+        def json(self):
+            return {"articles": [{"title": f"{self.query} headline {i + 1}", "url": f"https://example.com/{self.query}/{i + 1}"} for i in range(5)]}
+
+    def get(self, url, params=None, **kwargs):
+        latency.wait()
+        return FakeResponse((params or {}).get("q", ""))
+
+    requests.Session.get = get
+
+def install_stand_ins(args):
+    latency = Latency(args.latency, args.jitter)
+    sys.modules["yfinance"] = make_fake_yfinance(latency)
+    sys.modules["ccxt"] = make_fake_ccxt(latency)
+    sys.modules["openai"] = make_fake_openai(latency, args.llm_token_latency, args.llm_tokens)
+    patch_news(latency)
+
+# Point the on-disk caches (and the peer index stored with them) at path for the next app
+def use_cache_dir(path):
+    import disk_cache
+    import peer_index
+    os.environ["AGENTS_CACHE_DIR"] = path
+    disk_cache.CACHE_DIR = path
+    peer_index.INDEX_PATH = os.path.join(path, "peer_index.json")
+    peer_index._index = None
+
+# ---- Sessions ----
+
+# One simulated analyst: load the page, fill in the inputs, press the button; returns the timings
+def run_session(app, rng, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(HERE, f"{app}.py"), default_timeout=timeout)
+    if app == "stockAIAgent":
+        at.secrets["OPENAI_API_KEY"] = "load-test"
+        at.secrets["NEWS_API_KEY"] = "load-test"
+
+    start = time.perf_counter()
+    at.run()
+    loadSeconds = time.perf_counter() - start
+
+    if app == "stock_analyzer":
+        tickers = {weighted_choice(rng, STOCK_MIX) for _ in range(rng.choice([1, 1, 2, 3]))}
+        at.text_input[0].input(", ".join(sorted(tickers)))
+        label = ",".join(sorted(tickers))
+    elif app == "RSI_calculator":
+        if rng.random() < 0.5:
+            symbol = weighted_choice(rng, CRYPTO_MIX)
+            at.text_input[0].input(symbol)
+            at.selectbox[0].set_value("Crypto").run()
+            at.selectbox[1].set_value(weighted_choice(rng, CRYPTO_INTERVALS))
+        else:
+            symbol = weighted_choice(rng, STOCK_MIX)
+            at.text_input[0].input(symbol)
+        at.slider[0].set_value(rng.choice([7, 14, 30, 30, 60, 90]))
+        label = symbol
+    else:
+        label = weighted_choice(rng, STOCK_MIX)
+        at.text_input[0].input(label)
+
+    start = time.perf_counter()
+    at.button[0].click().run()
+    pageSeconds = time.perf_counter() - start
+
+    return {"app": app, "input": label, "load_seconds": loadSeconds, "page_seconds": pageSeconds,
+            "exceptions": len(at.exception), "error_messages": len(at.error)}
+
+# ---- Measurement ----
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+# Samples process RSS in the background to find the peak while sessions run
+class MemorySampler(threading.Thread):
+    def __init__(self, interval=0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss_mb()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.peak = max(self.peak, current_rss_mb())
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+# Load the page once and import the plotting libraries the apps load lazily, so module imports are not
+# counted against the first sessions; nothing is fetched, so the caches stay cold
+def warm_up(app, timeout):
+    from streamlit.testing.v1 import AppTest
+    import matplotlib.pyplot
+    import plotly.graph_objects
+
+    at = AppTest.from_file(os.path.join(HERE, f"{app}.py"), default_timeout=timeout)
+    if app == "stockAIAgent":
+        at.secrets["OPENAI_API_KEY"] = "load-test"
+        at.secrets["NEWS_API_KEY"] = "load-test"
+    at.run()
+
+def run_load(app, args):
+    rng = random.Random(args.seed)
+    seeds = [rng.random() for _ in range(args.sessions)]
+
+    warm_up(app, args.timeout)
+
+    baselineRss = current_rss_mb()
+    sampler = MemorySampler()
+    sampler.start()
+    cpuStart, wallStart = time.process_time(), time.perf_counter()
+
+    def session(seed):
+        try:
+            return run_session(app, random.Random(seed), args.timeout)
+        except Exception as e:
+            return {"app": app, "input": None, "load_seconds": None, "page_seconds": None,
+                    "exceptions": 1, "error_messages": 0, "harness_error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        sessions = list(executor.map(session, seeds))
+
+    wallSeconds = time.perf_counter() - wallStart
+    cpuSeconds = time.process_time() - cpuStart
+    sampler.stopped.set()
+    sampler.join()
+
+    # Crashed sessions return early, so latency and throughput only count sessions that rendered cleanly
+    succeeded = [s for s in sessions if not s["exceptions"] and not s["error_messages"]]
+    pages = [s["page_seconds"] for s in succeeded]
+    loads = [s["load_seconds"] for s in succeeded]
+    return {
+        "app": app,
+        "sessions": len(sessions),
+        "succeeded": len(succeeded),
+        "failure_rate": 1 - len(succeeded) / len(sessions),
+        "concurrency": args.concurrency,
+        "wall_seconds": wallSeconds,
+        "throughput_per_second": len(succeeded) / wallSeconds,
+        "page_p50": percentile(pages, 50) if pages else None,
+        "page_p95": percentile(pages, 95) if pages else None,
+        "page_p99": percentile(pages, 99) if pages else None,
+        "load_p50": percentile(loads, 50) if loads else None,
+        # CPU is process-wide (script and fetch threads cannot be attributed to one session), averaged per session
+        "cpu_seconds_per_session": cpuSeconds / len(sessions),
+        # Peak RSS growth over the warm process, spread over the sessions that were running at once
+        "peak_rss_mb": sampler.peak,
+        "rss_mb_per_concurrent_session": max(0.0, sampler.peak - baselineRss) / args.concurrency,
+        "sessions_with_exceptions": sum(1 for s in sessions if s["exceptions"]),
+        "sessions_with_error_messages": sum(1 for s in sessions if s["error_messages"]),
+        "harness_errors": sorted({s["harness_error"] for s in sessions if "harness_error" in s}),
+    }
+
+def print_report(result):
+    def seconds(value):
+        return f"{value:.3f}s" if value is not None else "n/a"
+
+    print(f"\n{result['app']}: {result['sessions']} sessions, {result['concurrency']} concurrent, {result['wall_seconds']:.1f}s")
+    print(f"  succeeded          {result['succeeded']} ({result['failure_rate'] * 100:.0f}% failed)")
+    print(f"  throughput         {result['throughput_per_second']:.2f} successful sessions/s")
+    print(f"  page latency (ok)  p50 {seconds(result['page_p50'])}  p95 {seconds(result['page_p95'])}  p99 {seconds(result['page_p99'])}")
+    print(f"  first load (ok)    p50 {seconds(result['load_p50'])}")
+    print(f"  CPU per session    {result['cpu_seconds_per_session']:.3f}s")
+    print(f"  memory             peak {result['peak_rss_mb']:.0f} MB, {result['rss_mb_per_concurrent_session']:.1f} MB per concurrent session")
+    print(f"  failures           {result['sessions_with_exceptions']} with exceptions, {result['sessions_with_error_messages']} with error messages")
+    for error in result["harness_errors"]:
+        print(f"  harness error      {error}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many concurrent analyst sessions against the Streamlit apps.")
+    parser.add_argument("--app", default="stock_analyzer", choices=APPS + ["all"], help="App to drive (default: stock_analyzer)")
+    parser.add_argument("--sessions", type=int, default=100, help="Simulated sessions per app (default: 100)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Sessions running at once (default: 10)")
+    parser.add_argument("--latency", type=float, default=0.1, help="Base seconds per upstream yfinance/ccxt/news call (default: 0.1)")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Random +/- fraction applied to each latency (default: 0.5)")
+    parser.add_argument("--llm-token-latency", type=float, default=0.01, help="Seconds per generated LLM token (default: 0.01)")
+    parser.add_argument("--llm-tokens", type=int, default=100, help="Tokens per LLM answer (default: 100)")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds before a page run is abandoned (default: 120)")
+    parser.add_argument("--cache-dir", help="Reuse this cache directory instead of starting from an empty one")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the ticker mix (default: 1)")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    sys.path.insert(0, HERE)
+    install_stand_ins(args)
+
+    results = []
+    for app in (APPS if args.app == "all" else [args.app]):
+        # Each app gets its own fresh directory, so it measures cold caches and not entries another app left behind
+        use_cache_dir(args.cache_dir or tempfile.mkdtemp(prefix=f"agents-load-test-{app}-"))
+        result = run_load(app, args)
+        print_report(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
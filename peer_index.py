@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from disk_cache import CACHE_DIR, atomic_write, read_cache, write_cache
+
+# Sector/industry index over the ticker universe, persisted between runs
+INDEX_PATH = os.path.join(CACHE_DIR, "peer_index.json")
+UNIVERSE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ticker_universe.txt")
+
+# Index entries and peer fundamentals are refreshed at most once per window
+PEER_REFRESH_WINDOW = 7 * 24 * 60 * 60
+
+# A peer whose ratios could not be fetched is retried after this many seconds
+PEER_FAILURE_TTL = 30 * 60
+
+# Fall back to the whole sector when the industry has fewer peers than this
+MIN_PEERS = 3
+
+# Parallel upstream calls while refreshing
+REFRESH_WORKERS = 8
+
+# Upstream peer fetches in flight at once across every session of a process, to stay under the rate limits
+PEER_FETCH_LIMIT = 4
+
+_lock = threading.Lock()
+_fetchSlots = threading.BoundedSemaphore(PEER_FETCH_LIMIT)
+_index = None
+_indexMtime = None
+
+# Read the ticker universe: one symbol per line, '#' starts a comment
+def load_universe(path=UNIVERSE_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        lines = [line.split("#")[0].strip().upper() for line in f]
+    return [line for line in lines if line]
+
+# Rebuild the industry and sector lookups from the per-ticker entries
+def group_index(tickers):
+    industries, sectors = {}, {}
+    for ticker, entry in sorted(tickers.items()):
+        if entry.get("industry"):
+            industries.setdefault(entry["industry"], []).append(ticker)
+        if entry.get("sector"):
+            sectors.setdefault(entry["sector"], []).append(ticker)
+    return {"tickers": tickers, "industries": industries, "sectors": sectors}
+
+def index_mtime():
+    try:
+        return os.stat(INDEX_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+def read_index():
+    try:
+        with open(INDEX_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return group_index({})
+
+# Load the index from disk, reading it again whenever another process (e.g. the prefetch worker) has saved it
+def load_index():
+    global _index, _indexMtime
+    with _lock:
+        mtime = index_mtime()
+        if _index is None or mtime != _indexMtime:
+            _index = read_index()
+            _indexMtime = mtime
+        return _index
+
+def save_index(index):
+    atomic_write(INDEX_PATH, json.dumps(index))
+
+# Held while an index update is read, merged and saved, so app processes and the worker never drop each other's entries
+# fcntl is not available on Windows, where only threads of this process are serialized
+@contextlib.contextmanager
+def index_lock():
+    with _lock:
+        os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+        with open(f"{INDEX_PATH}.lock", "w") as f:
+            try:
+                import fcntl
+                fcntl.flock(f, fcntl.LOCK_EX)
+            except ImportError:
+                pass
+            yield
+
+# Function to fetch the classification of one ticker
+def get_classification(ticker):
+    import yfinance as yf
+    info = yf.Ticker(ticker).info
+    return {"sector": info.get("sector"), "industry": info.get("industry"), "refreshed_at": time.time()}
+
+# Add missing tickers and refresh stale ones; entries inside the refresh window are left alone
+# With stagger, tickers are classified one at a time with stagger seconds between upstream calls
+# Returns the tickers that were fetched
+def refresh_index(tickers=None, max_age=PEER_REFRESH_WINDOW, stagger=None):
+    global _index, _indexMtime
+    tickers = load_universe() if tickers is None else [t.upper() for t in tickers]
+    index = load_index()
+    now = time.time()
+    stale = [t for t in tickers
+             if t not in index["tickers"] or now - index["tickers"][t]["refreshed_at"] > max_age]
+    if not stale:
+        return []
+
+    def fetch(ticker):
+        try:
+            with _fetchSlots:
+                return ticker, get_classification(ticker)
+        except Exception as e:
+            print(f"Could not classify {ticker}: {str(e)}")
+            return ticker, None
+
+    if stagger is None:
+        with ThreadPoolExecutor(max_workers=REFRESH_WORKERS) as executor:
+            results = list(executor.map(fetch, stale))
+    else:
+        results = []
+        for i, ticker in enumerate(stale):
+            if i:
+                time.sleep(stagger)
+            results.append(fetch(ticker))
+
+    # Merge into the index as it is on disk now, not the copy read before fetching
+    with index_lock():
+        entries = dict(read_index()["tickers"])
+        for ticker, entry in results:
+            if entry is not None:
+                entries[ticker] = entry
+        _index = group_index(entries)
+        save_index(_index)
+        _indexMtime = index_mtime()
+    return [ticker for ticker, entry in results if entry is not None]
+
+# Function to find the peers of a ticker: same industry, or same sector if the industry is too small
+def get_peers(ticker):
+    ticker = ticker.upper()
+    refresh_index([ticker])
+    index = load_index()
+    entry = index["tickers"].get(ticker)
+    if entry is None:
+        return None, []
+
+    peers = [t for t in index["industries"].get(entry.get("industry"), []) if t != ticker]
+    if len(peers) < MIN_PEERS:
+        peers = [t for t in index["sectors"].get(entry.get("sector"), []) if t != ticker]
+    return entry, peers
+
+# Ratios for one peer, fetched at most once per refresh window
+# fetch_ratios takes a ticker and returns a dict of ratio name -> value (empty when the data is unavailable)
+def get_peer_ratios(ticker, fetch_ratios):
+    cached = read_cache("peer_ratios", ticker, PEER_REFRESH_WINDOW)
+    if cached:
+        return cached
+    # Failures are remembered only briefly, so a transient error does not drop the peer for the whole window
+    if read_cache("peer_ratio_failures", ticker, PEER_FAILURE_TTL) is not None:
+        return {}
+    try:
+        with _fetchSlots:
+            ratios = fetch_ratios(ticker)
+    except Exception as e:
+        print(f"Could not fetch ratios for {ticker}: {str(e)}")
+        ratios = {}
+    if ratios:
+        write_cache("peer_ratios", ticker, ratios)
+    else:
+        write_cache("peer_ratio_failures", ticker, True)
+    return ratios
+
+# Function to compare a ticker's ratios against the median of its peer group
+def compare_with_peers(ticker, target_ratios, fetch_ratios):
+    entry, peers = get_peers(ticker)
+    if entry is None or not peers:
+        return entry, pd.DataFrame()
+
+    with ThreadPoolExecutor(max_workers=REFRESH_WORKERS) as executor:
+        peerRatios = list(executor.map(lambda peer: get_peer_ratios(peer, fetch_ratios), peers))
+
+    peerTable = pd.DataFrame(peerRatios, index=peers)
+    comparison = pd.DataFrame({
+        ticker.upper(): pd.Series(target_ratios, dtype=float),
+        "Peer median": peerTable.median(numeric_only=True),
+        "Peers reporting": peerTable.count(),
+    })
+    return entry, comparison.dropna(subset=[ticker.upper()])
+
+# Build or refresh the index over the ticker universe:
+#   python peer_index.py                # only missing and stale tickers
+#   python peer_index.py --force        # every ticker
+#   python peer_index.py --stagger 2    # one ticker at a time, 2 seconds apart
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Build or refresh the sector/industry peer index.")
+    parser.add_argument("--universe", default=UNIVERSE_PATH, help="Ticker universe file (default: ticker_universe.txt)")
+    parser.add_argument("--force", action="store_true", help="Refresh every ticker, not only missing and stale ones")
+    parser.add_argument("--stagger", type=float, default=None, help="Seconds between upstream calls (default: parallel)")
+    args = parser.parse_args()
+
+    refreshed = refresh_index(load_universe(args.universe), max_age=0 if args.force else PEER_REFRESH_WINDOW,
+                              stagger=args.stagger)
+    index = load_index()
+    print(f"Refreshed {len(refreshed)} tickers; index holds {len(index['tickers'])} tickers "
+          f"in {len(index['industries'])} industries")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from disk_cache import CACHE_DIR, atomic_write
+from peer_index import refresh_index
+
+# Background worker that keeps the apps' disk caches warm for a watchlist.
+# Run it next to the Streamlit servers:  python prefetch_worker.py --watchlist watchlist.txt
+# Show the last run:                     python prefetch_worker.py --status
+
+WATCHLIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "watchlist.txt")
+STATUS_PATH = os.path.join(CACHE_DIR, "prefetch_status.json")
+
+# Entries younger than this fraction of their TTL are left alone, so the apps never see them expire
+REFRESH_FRACTION = 0.5
+
+# Read the watchlist: one symbol per line, 'crypto:' marks a crypto symbol, '#' starts a comment
+def load_watchlist(path=WATCHLIST_PATH):
+    stocks, cryptos = [], []
+    with open(path) as f:
+        for line in f:
+            symbol = line.split("#")[0].strip().upper()
+            if not symbol:
+                continue
+            if symbol.startswith("CRYPTO:"):
+                cryptos.append(symbol[len("CRYPTO:"):].strip())
+            else:
+                stocks.append(symbol)
+    return stocks, cryptos
+
+# One job per cached call the apps make for a symbol: (name, cached function, arguments)
+def build_jobs(stocks, cryptos, days, crypto_intervals):
+    import stock_analyzer
+    import RSI_calculator
+
+    fetchers = [("analyzer financials", stock_analyzer.fetch_financials),
+                ("price history 5y", stock_analyzer.get_price_history)]
+    try:
+        import stockAIAgent
+        fetchers.append(("agent financials", stockAIAgent.fetch_financials))
+    except Exception as e:
+        print(f"Skipping stockAIAgent financials: {str(e)}")
+
+    jobs = []
+    for ticker in stocks:
+        for name, fetch in fetchers:
+            jobs.append((f"{name} {ticker}", fetch, (ticker,)))
+        jobs.append((f"stock prices {ticker} 1d/{days}d", RSI_calculator.get_stock_data, (ticker, "1d", days)))
+    for symbol in cryptos:
+        for interval in crypto_intervals:
+            jobs.append((f"crypto ohlcv {symbol} {interval}/{days}d", RSI_calculator.load_crypto_data, (symbol, interval, days)))
+    return jobs
+
+def load_status():
+    try:
+        with open(STATUS_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"last_run_started": None, "last_run_finished": None, "jobs": {}}
+
+def save_status(status):
+    atomic_write(STATUS_PATH, json.dumps(status, indent=2))
+
+# Refresh every stale job once, sleeping `stagger` seconds after each upstream fetch to respect rate limits
+def run_once(jobs, stagger):
+    status = load_status()
+    status["last_run_started"] = time.time()
+    save_status(status)
+
+    # Keep the peer-group index over the ticker universe current; only missing and stale tickers are fetched, staggered like the jobs
+    peerStatus = status.setdefault("peer_index", {"refreshed_at": None, "tickers_refreshed": 0, "last_error": None})
+    try:
+        peerStatus["tickers_refreshed"] = len(refresh_index(stagger=stagger))
+        peerStatus["refreshed_at"] = time.time()
+        peerStatus["last_error"] = None
+    except Exception as e:
+        peerStatus["last_error"] = str(e)
+        print(f"Peer index refresh failed: {str(e)}")
+    save_status(status)
+
+    for name, fetch, args in jobs:
+        entry = status["jobs"].setdefault(name, {"cached_at": None, "last_error": None, "failures": 0, "total_failures": 0})
+        age = fetch.age(*args)
+        if age is not None and age < fetch.ttl * REFRESH_FRACTION:
+            entry["cached_at"] = time.time() - age
+            continue
+
+        try:
+            value = fetch.refresh(*args)
+            if value is None or (fetch.keep is not None and not fetch.keep(value)):
+                raise ValueError(value[3] if isinstance(value, list) else "no data returned")
+            entry["cached_at"] = time.time()
+            entry["last_error"] = None
+            entry["failures"] = 0
+        except Exception as e:
+            entry["last_error"] = str(e)
+            entry["failures"] += 1
+            entry["total_failures"] += 1
+            print(f"Prefetch failed for {name}: {str(e)}")
+        save_status(status)
+        time.sleep(stagger)
+
+    status["last_run_finished"] = time.time()
+    save_status(status)
+    return status
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") if timestamp else "never"
+
+def print_status(status):
+    print(f"Last run started:  {format_time(status['last_run_started'])}")
+    print(f"Last run finished: {format_time(status['last_run_finished'])}")
+    peerStatus = status.get("peer_index")
+    if peerStatus:
+        line = f"Peer index:        refreshed {format_time(peerStatus['refreshed_at'])} ({peerStatus['tickers_refreshed']} tickers)"
+        if peerStatus["last_error"]:
+            line += f", last error: {peerStatus['last_error']}"
+        print(line)
+    now = time.time()
+    for name, entry in sorted(status["jobs"].items()):
+        freshness = f"{(now - entry['cached_at']) / 60:.0f} min old" if entry["cached_at"] else "not cached"
+        line = f"  {name}: {freshness}, failures {entry['failures']} (total {entry['total_failures']})"
+        if entry["last_error"]:
+            line += f", last error: {entry['last_error']}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep the app caches warm for a watchlist.")
+    parser.add_argument("--watchlist", default=WATCHLIST_PATH, help="Watchlist file (default: watchlist.txt)")
+    parser.add_argument("--interval", type=float, default=15 * 60, help="Seconds between runs (default: 900)")
+    parser.add_argument("--stagger", type=float, default=2.0, help="Seconds to wait after each upstream fetch (default: 2)")
+    parser.add_argument("--days", type=int, default=30, help="Days of price history, as in the RSI app (default: 30)")
+    parser.add_argument("--crypto-intervals", default="1h,1d", help="Comma-separated crypto candle sizes (default: 1h,1d)")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    parser.add_argument("--status", action="store_true", help="Print the last run status and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        print_status(load_status())
+        return
+
+    stocks, cryptos = load_watchlist(args.watchlist)
+    jobs = build_jobs(stocks, cryptos, args.days, [i.strip() for i in args.crypto_intervals.split(",") if i.strip()])
+    print(f"Prefetching {len(jobs)} jobs for {len(stocks)} stocks and {len(cryptos)} crypto symbols")
+
+    while True:
+        started = time.time()
+        status = run_once(jobs, args.stagger)
+        failed = sum(1 for name, _, _ in jobs if status["jobs"][name]["failures"])
+        print(f"Run finished at {format_time(status['last_run_finished'])}: {failed} failing jobs")
+        if args.once:
+            sys.exit(1 if failed else 0)
+        time.sleep(max(0, args.interval - (time.time() - started)))
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,13 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import requests
-from openai import OpenAI
-import matplotlib.pyplot as plt
-from bs4 import BeautifulSoup
+import json
+import functools
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from disk_cache import cache_key, read_cache, write_cache, disk_cached
+from financial_digest import build_digest, build_batch_prompt, digest_report, financial_ratios
+from peer_index import compare_with_peers
 
 def percentIncrease(df):
 
@@ -28,14 +29,48 @@ def percentIncrease(df):
                               index = df.index)
     return dfPercents
 
-# Set your OpenAI API key
-OPENAI_API_KEY = st.secrets["OPENAI_API_KEY"]
-NEWS_API_KEY = st.secrets["NEWS_API_KEY"]
-
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-# Function to fetch financial data
+# Set your OpenAI API key (read from st.secrets the first time the LLM is called, so importing needs no secrets)
+@functools.lru_cache(maxsize=None)
+def get_client():
+    from openai import OpenAI
+    return OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
+
+# Shared HTTP session so news requests reuse pooled connections
+@functools.lru_cache(maxsize=None)
+def get_news_session():
+    import requests
+    session = requests.Session()
+    session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
+
+# Statement data is kept for a day; the 5-year closing prices go stale much faster and are cached on their own
+FINANCIALS_TTL = 24 * 60 * 60
+PRICE_TTL = 30 * 60
+
+# Function to fetch the 5-year closing price history
+@disk_cached("price_history", PRICE_TTL)
+def get_price_history(ticker):
+    import yfinance as yf
+    return yf.Ticker(ticker).history(period="5y")["Close"]
+
+# Function to fetch financial data, with the price history from its own cache
 def get_financials(ticker):
+    return add_price_history(ticker, fetch_financials(ticker))
+
+# Fill the price history slot of a fetch_financials result; a price feed failure is returned as an error result
+def add_price_history(ticker, result):
+    [financials, scaleTicker, _, companyName] = result
+    if financials is None:
+        return [financials, scaleTicker, None, companyName]
+    try:
+        return [financials, scaleTicker, get_price_history(ticker), companyName]
+    except Exception as e:
+        return [None, None, None, f"Error: An unexpected issue occurred with '{ticker}': {str(e)}"]
+
+# Function to fetch the statement data (MarketCap uses prices around past balance sheet dates, which do not change)
+@disk_cached("agent_financials", FINANCIALS_TTL, keep=lambda result: result[0] is not None)
+def fetch_financials(ticker):
+  import yfinance as yf
 
   try:
 
@@ -71,8 +106,6 @@ def get_financials(ticker):
     #The Book Value of a company represents its net asset value, or how much the company would be worth if it sold all its assets and paid off all its liabilities.
     #The Book value is the same as Stockholders Equity.
 
-    stockPriceHistory = stock.history(period="5y")["Close"]
-
     marketCap = []
 
     for day in ordinaryShares.index:
@@ -98,195 +131,379 @@ def get_financials(ticker):
     dfTicker = pd.DataFrame(data = financials, index = ordinaryShares.index)
     scaleTicker = percentIncrease(dfTicker)
 
-    return [financials, scaleTicker, stockPriceHistory, stock.info['longName']]
+    return [financials, scaleTicker, None, stock.info['longName']]
   
   except Exception as e:
     return [None, None, None, f"Error: An unexpected issue occurred with '{ticker}': {str(e)}"]
 
+# Dates for list-valued metrics such as MarketCap, which follow the balance sheet periods
+def financials_index(financials):
+    shares = financials.get("Ordinary Shares")
+    return shares.index if isinstance(shares, pd.Series) else None
+
+# Ratios used to compare a company with its peers
+def get_ratios(ticker):
+    financials = fetch_financials(ticker)[0]
+    if financials is None:
+        return {}
+    return financial_ratios(financials, financials_index(financials))
+
 # Function to compare with competitors
-# def get_competitor_data(ticker):
-#     stock = yf.Ticker(ticker)
-#     competitors = stock.info.get("industry")
-#     return competitors  # Placeholder for competitor analysis
-
-# # Function to analyze executive team
-# def get_executive_data(ticker):
-#     stock = yf.Ticker(ticker)
-#     return stock.info.get("companyOfficers", [])
-
-# # Function to generate AI insights
-# def get_ai_insights(company_name):
-#     prompt = f"""Analyze the financial health, future prospects, and challenges for {company_name}.
-#     Consider its recent earnings, industry trends, and executive leadership."""
-
-#     response = client.chat.completions.create(
-#         model="gpt-4",
-#         messages=[
-#             {"role": "system", "content": "You are a financial analyst."},
-#             {"role": "user", "content": prompt}
-#         ]
-#     )
-
-#     return response.choices[0].message.content
-
-# # Function to fetch real-time news
-# def get_latest_news(company_name):
-#     url = f"https://newsapi.org/v2/everything?q={company_name}&apiKey={NEWS_API_KEY}"
-#     response = requests.get(url).json()
-#     articles = response.get("articles", [])[:5]
-#     return [{"title": article["title"], "url": article["url"]} for article in articles]
-
-# # Function to predict stock price
-# def predict_stock_price(ticker):
-#     stock = yf.Ticker(ticker)
-#     hist = stock.history(period="1y")["Close"]
-#     forecast = hist.rolling(window=5).mean().iloc[-1]  # Simple moving average prediction
-#     return forecast
+# Peers come from the local sector/industry index; their ratios are cached for the refresh window
+def get_competitor_data(ticker, financials):
+    targetRatios = financial_ratios(financials, financials_index(financials))
+    return compare_with_peers(ticker, targetRatios, get_ratios)
+
+# Function to analyze executive team
+def get_executive_data(ticker):
+    import yfinance as yf
+    stock = yf.Ticker(ticker)
+    return stock.info.get("companyOfficers", [])
+
+# Cached insights are reused for this many seconds before the model is asked again
+INSIGHTS_TTL = 6 * 60 * 60
+
+# Serialize the financial data so the same numbers always give the same cache key
+def financial_snapshot(financials):
+    snapshot = {}
+    for metric, values in financials.items():
+        if isinstance(values, str):
+            snapshot[metric] = values
+        else:
+            snapshot[metric] = [str(v) for v in np.asarray(values).tolist()]
+    return json.dumps(snapshot, sort_keys=True)
+
+# Stream the answer tokens and save the full text once the stream completes
+def stream_ai_insights(stream, cacheKey):
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        token = chunk.choices[0].delta.content
+        if token:
+            parts.append(token)
+            yield token
+    write_cache("insights", cacheKey, "".join(parts))
+
+def insights_prompt(company_name, digest):
+    return f"""Analyze the financial health, future prospects, and challenges for {company_name}.
+    Consider its recent earnings, industry trends, and executive leadership.
+
+    Financial digest:
+    {digest}"""
+
+# Function to generate AI insights
+# Returns [insights, digest report]; insights is the cached text on a hit, or a token generator on a miss.
+# Pass llm to use any object with the OpenAI chat.completions.create interface instead of the default client.
+def get_ai_insights(company_name, financials, llm=None):
+    # The prompt carries a compact digest rather than the raw financials to keep it small
+    digest = build_digest(company_name, financials, financials_index(financials))
+    report = digest_report(company_name, financials, digest)
+    prompt = insights_prompt(company_name, digest)
+
+    cacheKey = cache_key(prompt, financial_snapshot(financials))
+    cached = read_cache("insights", cacheKey, INSIGHTS_TTL)
+    if cached is not None:
+        return [cached, report]
+
+    stream = (llm or get_client()).chat.completions.create(
+        model="gpt-4",
+        messages=[
+            {"role": "system", "content": "You are a financial analyst."},
+            {"role": "user", "content": prompt}
+        ],
+        stream=True
+    )
+
+    return [stream_ai_insights(stream, cacheKey), report]
+
+# Function to generate AI insights for several companies in one request
+# companies is a list of (company_name, financials) pairs
+def get_batch_ai_insights(companies, llm=None):
+    digests = [build_digest(name, financials, financials_index(financials)) for name, financials in companies]
+    prompt = build_batch_prompt(digests)
+
+    cacheKey = cache_key(prompt)
+    cached = read_cache("insights", cacheKey, INSIGHTS_TTL)
+    if cached is not None:
+        return cached
+
+    response = (llm or get_client()).chat.completions.create(
+        model="gpt-4",
+        messages=[
+            {"role": "system", "content": "You are a financial analyst."},
+            {"role": "user", "content": prompt}
+        ]
+    )
+
+    insights = response.choices[0].message.content
+    write_cache("insights", cacheKey, insights)
+    return insights
+
+# Raised by the panels that depend on the statement data when it failed; the financials panel already shows the error
+class FinancialsUnavailable(Exception):
+    pass
+
+# The financials panel adds the price history to the shared fetch_financials result
+def load_financials(ticker, statements_future):
+    return add_price_history(ticker, statements_future.result())
+
+# Insights and competitors only need the statement data, so they start as soon as fetch_financials returns
+# and do not depend on the price feed
+def wait_for_financials(statements_future):
+    financials, _, _, companyName = statements_future.result()
+    if financials is None:
+        raise FinancialsUnavailable(companyName)
+    return financials, companyName
+
+def load_ai_insights(ticker, statements_future):
+    financials, companyName = wait_for_financials(statements_future)
+    return get_ai_insights(companyName, financials)
+
+def load_competitor_data(ticker, statements_future):
+    financials, _ = wait_for_financials(statements_future)
+    return get_competitor_data(ticker, financials)
+
+# Company names do not change, so a single info lookup is kept for a month
+@disk_cached("company_names", 30 * 24 * 60 * 60)
+def get_company_name(ticker):
+    import yfinance as yf
+    return yf.Ticker(ticker).info.get("longName")
+
+# News queries by company name, looked up on its own so news does not wait for get_financials
+def load_latest_news(ticker):
+    return get_latest_news(get_company_name(ticker) or ticker)
+
+# Function to fetch real-time news
+def get_latest_news(company_name):
+    url = "https://newsapi.org/v2/everything"
+    response = get_news_session().get(url, params={"q": company_name, "apiKey": st.secrets["NEWS_API_KEY"]}, timeout=10).json()
+    articles = response.get("articles", [])[:5]
+    return [{"title": article["title"], "url": article["url"]} for article in articles]
+
+# Function to predict stock price
+def predict_stock_price(ticker):
+    import yfinance as yf
+    stock = yf.Ticker(ticker)
+    hist = stock.history(period="1y")["Close"]
+    forecast = hist.rolling(window=5).mean().iloc[-1]  # Simple moving average prediction
+    return forecast
+
+# Display the financial charts
+def render_financials(financials, scaleTicker, stockPriceHistory, companyName):
+    import matplotlib.pyplot as plt
+
+    if financials is None:
+        st.error(companyName)  # Display the error message
+        return
+
+    # Graph 1: Scaled EBIT and EBITDA
+    st.subheader("EBIT and EBITDA (Percentage Change)")
+    plt.figure(figsize=(10, 4))
+    for metric in ["EBIT", "EBITDA"]:
+        if metric in scaleTicker.columns:
+            plt.plot(scaleTicker.index, scaleTicker[metric], label=metric)
+    plt.title(f"EBIT and EBITDA Trends for {companyName}", fontsize=12)
+    plt.xlabel("Date", fontsize=10)
+    plt.ylabel("Percentage Change", fontsize=10)
+    plt.legend(title="Metrics", bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    st.pyplot(plt.gcf())
+    st.write(
+        "- **EBIT**: Net Income + Interest Expense + Taxes (Earnings Before Interest & Taxes). EBIT is used to evaluate "
+        "a company’s core profitability from its business operations, without considering tax strategies or financing "
+        "choices (debt vs. equity).\n"
+        "- **EBITDA**: EBIT plus Depreciation and Amortization, reflecting cash flow potential before non-cash expenses."
+        "EBITDA measures a company’s profitability before non-cash expenses (depreciation & amortization) and financial decisions (interest & taxes)."
+    )
+    plt.clf()
+
+    # Graph 2: Scaled Gross Profit, Net Income, Total Revenue
+    st.subheader("Total Revenue, Gross Profit and Net Income (Percentage Change)")
+    plt.figure(figsize=(10, 4))
+    for metric in ["Total Revenue", "Gross Profit", "Net Income"]:
+        if metric in scaleTicker.columns:
+            plt.plot(scaleTicker.index, scaleTicker[metric], label=metric)
+    plt.title(f"Profit and Revenue Trends for {companyName}", fontsize=12)
+    plt.xlabel("Date", fontsize=10)
+    plt.ylabel("Percentage Change", fontsize=10)
+    plt.legend(title="Metrics", bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    st.pyplot(plt.gcf())
+    st.write(
+        "- **Total Revenue**: Total amount of money the company made from all its operations (product sales, services, etc.) before any costs or expenses are deducted.\n"
+        "- **Gross Profit**: Revenue - Cost of Goods Sold; How much is left after subtracting the direct cost of producing goods/services\n"
+        "- **Net Income**: Total Revenue - (Cost of Goods Sold + Operating Expenses + Interest Expense + Taxes + Any Other Costs). It represents "
+        "the final measure of profitability—i.e., what’s left for shareholders or reinvestment after every cost is paid."
+    )
+    plt.clf()
+
+    # Graph 3: Scaled Stockholders Equity, MarketCap, Ordinary Shares
+    st.subheader("Equity, Market Cap, and Shares (Percentage Change)")
+    plt.figure(figsize=(10, 4))
+    for metric in ["Stockholders Equity", "MarketCap", "Ordinary Shares"]:
+        if metric in scaleTicker.columns:
+            plt.plot(scaleTicker.index, scaleTicker[metric], label=metric)
+    plt.title(f"Equity and Market Trends for {companyName}", fontsize=12)
+    plt.xlabel("Date", fontsize=10)
+    plt.ylabel("Percentage Change", fontsize=10)
+    plt.legend(title="Metrics", bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    st.pyplot(plt.gcf())
+    st.write(
+        "- **Stockholders Equity**: Net asset value (assets minus liabilities), or book value, or how much the company would be worth if it sold all its assets and paid off all its liabilities.\n"
+        "- **MarketCap**: Market value of all shares, reflecting investor perception.\n"
+        "- **Ordinary Shares**: Number of shares available, affecting ownership dilution."
+    )
+    plt.clf()
+
+    # Graph 4: Raw Company Value Perception
+    st.subheader("Company Value Perception (Raw Data)")
+    plt.figure(figsize=(10, 4))
+    if "Company value perception" in financials:
+        plt.plot(scaleTicker.index, financials["Company value perception"], label="Company Value Perception", color='purple')
+    plt.title(f"Company Value Perception for {companyName}", fontsize=12)
+    plt.xlabel("Date", fontsize=10)
+    plt.ylabel("Market Cap / Equity Ratio", fontsize=10)
+    plt.legend(title="Metrics", bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    st.pyplot(plt.gcf())
+    st.write(
+        "- **Company Value Perception**: Market Cap divided by Stockholders Equity, indicating how the market values the company relative to its book value."
+    )
+    plt.clf()
+
+    # Graph 5: Scaled Research and Development
+    st.subheader("Research and Development (Percentage Change)")
+    plt.figure(figsize=(10, 4))
+    if "Research And Development" in scaleTicker.columns:
+        plt.plot(scaleTicker.index, scaleTicker["Research And Development"], label="R&D", color='green')
+    plt.title(f"R&D Trends for {companyName}", fontsize=12)
+    plt.xlabel("Date", fontsize=10)
+    plt.ylabel("Percentage Change", fontsize=10)
+    plt.legend(title="Metrics", bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    st.pyplot(plt.gcf())
+    st.write(
+        "- **Research And Development**: Investment in innovation and future growth, showing commitment to new products or services."
+    )
+    plt.clf()
+
+    # Display stock price trend
+    st.subheader("Stock Price Trend")
+    plt.figure(figsize=(10, 4))
+    plt.plot(stockPriceHistory.index, stockPriceHistory, label="Closing Price", color='blue')
+    plt.title(f"5-Year Stock Price History for {companyName}", fontsize=12)
+    plt.xlabel("Date", fontsize=10)
+    plt.ylabel("Stock Price (USD)", fontsize=10)
+    plt.legend(title="Price", bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    st.pyplot(plt.gcf())
+    plt.clf()  # Clear the figure
+
+# Display the competitor analysis
+def render_competitors(classification, comparison):
+    st.subheader("Competitor Analysis")
+    if classification is None:
+        st.write("No sector or industry information is available for this ticker.")
+        return
+    st.write(f"**Industry**: {classification.get('industry')} ({classification.get('sector')})")
+    if comparison.empty:
+        st.write("No peers with comparable data were found in the ticker universe.")
+    else:
+        st.dataframe(comparison)
+
+# Display the executive team report
+def render_executives(executives):
+    st.subheader("Executive Team")
+    for exec in executives:
+        st.write(f"**{exec.get('name')}** - {exec.get('title')}")
+
+# Display the AI-generated insights
+def render_insights(insights, report):
+    st.subheader("AI Investment Insights")
+    if isinstance(insights, str):
+        st.write(insights)
+    else:
+        st.write_stream(insights)
+    st.caption(f"Prompt digest: {report['digest_tokens']} tokens instead of {report['naive_tokens']} "
+               f"({report['saved_percent']:.0f}% smaller than the raw financial data).")
+
+# Display the real-time news
+def render_news(news):
+    st.subheader("Latest News")
+    for article in news:
+        st.write(f"[{article['title']}]({article['url']})")
+
+# Display the stock price prediction
+def render_prediction(predicted_price):
+    st.subheader("Stock Price Prediction")
+    st.write(f"Predicted Stock Price (based on trend analysis): ${predicted_price:.2f}")
+
+# Each panel: (fetch function, render function, unpack result as arguments)
+PANELS = {
+    "financials": (load_financials, render_financials, True),
+    "competitors": (load_competitor_data, render_competitors, True),
+    "executives": (get_executive_data, render_executives, False),
+    "insights": (load_ai_insights, render_insights, True),
+    "news": (load_latest_news, render_news, False),
+    "prediction": (predict_stock_price, render_prediction, False),
+}
+
+# Render one finished panel into its slot
+def show_panel(slot, panel, result, ticker):
+    _, render, unpack = PANELS[panel]
+    with slot:
+        try:
+            if unpack:
+                render(*result)
+            else:
+                render(result)
+        except Exception as e:
+            st.error(f"Error: Could not load {panel} for '{ticker}': {str(e)}")
 
 # Streamlit UI
 def main():
     st.title("AI Stock Investment Advisor")
     #company_name = st.text_input("Enter Company Name:")
-    ticker = st.text_input("Enter Stock Ticker Symbol:")
+    ticker = st.text_input("Enter Stock Ticker Symbol:").strip().upper()
     
     if st.button("Analyze Stock"):
         if ticker:
+            # Reserve a slot per panel so the page layout stays fixed while panels finish out of order
+            slots = {panel: st.container() for panel in PANELS}
+
+            # The network-bound stages overlap, so page latency is roughly the slowest stage
             with st.spinner("Fetching data..."):
-                [financials, scaleTicker, stockPriceHistory, companyName] = get_financials(ticker)
-                # competitors = get_competitor_data(ticker)
-                # executives = get_executive_data(ticker)
-                # insights = get_ai_insights(company_name)
-                # news = get_latest_news(company_name)
-                # predicted_price = predict_stock_price(ticker)
-
-            if financials is None:
-                st.error(companyName)  # Display the error message
-            else:
-                # Graph 1: Scaled EBIT and EBITDA
-                st.subheader("EBIT and EBITDA (Percentage Change)")
-                plt.figure(figsize=(10, 4))
-                for metric in ["EBIT", "EBITDA"]:
-                    if metric in scaleTicker.columns:
-                        plt.plot(scaleTicker.index, scaleTicker[metric], label=metric)
-                plt.title(f"EBIT and EBITDA Trends for {companyName}", fontsize=12)
-                plt.xlabel("Date", fontsize=10)
-                plt.ylabel("Percentage Change", fontsize=10)
-                plt.legend(title="Metrics", bbox_to_anchor=(1.05, 1), loc='upper left')
-                plt.grid(True, linestyle='--', alpha=0.7)
-                st.pyplot(plt.gcf())
-                st.write(
-                    "- **EBIT**: Net Income + Interest Expense + Taxes (Earnings Before Interest & Taxes). EBIT is used to evaluate "
-                    "a company’s core profitability from its business operations, without considering tax strategies or financing "
-                    "choices (debt vs. equity).\n"
-                    "- **EBITDA**: EBIT plus Depreciation and Amortization, reflecting cash flow potential before non-cash expenses."
-                    "EBITDA measures a company’s profitability before non-cash expenses (depreciation & amortization) and financial decisions (interest & taxes)."
-                )
-                plt.clf()
-
-                # Graph 2: Scaled Gross Profit, Net Income, Total Revenue
-                st.subheader("Total Revenue, Gross Profit and Net Income (Percentage Change)")
-                plt.figure(figsize=(10, 4))
-                for metric in ["Total Revenue", "Gross Profit", "Net Income"]:
-                    if metric in scaleTicker.columns:
-                        plt.plot(scaleTicker.index, scaleTicker[metric], label=metric)
-                plt.title(f"Profit and Revenue Trends for {companyName}", fontsize=12)
-                plt.xlabel("Date", fontsize=10)
-                plt.ylabel("Percentage Change", fontsize=10)
-                plt.legend(title="Metrics", bbox_to_anchor=(1.05, 1), loc='upper left')
-                plt.grid(True, linestyle='--', alpha=0.7)
-                st.pyplot(plt.gcf())
-                st.write(
-                    "- **Total Revenue**: Total amount of money the company made from all its operations (product sales, services, etc.) before any costs or expenses are deducted.\n"
-                    "- **Gross Profit**: Revenue - Cost of Goods Sold; How much is left after subtracting the direct cost of producing goods/services\n"
-                    "- **Net Income**: Total Revenue - (Cost of Goods Sold + Operating Expenses + Interest Expense + Taxes + Any Other Costs). It represents "
-                    "the final measure of profitability—i.e., what’s left for shareholders or reinvestment after every cost is paid."
-                )
-                plt.clf()
-
-                # Graph 3: Scaled Stockholders Equity, MarketCap, Ordinary Shares
-                st.subheader("Equity, Market Cap, and Shares (Percentage Change)")
-                plt.figure(figsize=(10, 4))
-                for metric in ["Stockholders Equity", "MarketCap", "Ordinary Shares"]:
-                    if metric in scaleTicker.columns:
-                        plt.plot(scaleTicker.index, scaleTicker[metric], label=metric)
-                plt.title(f"Equity and Market Trends for {companyName}", fontsize=12)
-                plt.xlabel("Date", fontsize=10)
-                plt.ylabel("Percentage Change", fontsize=10)
-                plt.legend(title="Metrics", bbox_to_anchor=(1.05, 1), loc='upper left')
-                plt.grid(True, linestyle='--', alpha=0.7)
-                st.pyplot(plt.gcf())
-                st.write(
-                    "- **Stockholders Equity**: Net asset value (assets minus liabilities), or book value, or how much the company would be worth if it sold all its assets and paid off all its liabilities.\n"
-                    "- **MarketCap**: Market value of all shares, reflecting investor perception.\n"
-                    "- **Ordinary Shares**: Number of shares available, affecting ownership dilution."
-                )
-                plt.clf()
-
-                # Graph 4: Raw Company Value Perception
-                st.subheader("Company Value Perception (Raw Data)")
-                plt.figure(figsize=(10, 4))
-                if "Company value perception" in financials:
-                    plt.plot(scaleTicker.index, financials["Company value perception"], label="Company Value Perception", color='purple')
-                plt.title(f"Company Value Perception for {companyName}", fontsize=12)
-                plt.xlabel("Date", fontsize=10)
-                plt.ylabel("Market Cap / Equity Ratio", fontsize=10)
-                plt.legend(title="Metrics", bbox_to_anchor=(1.05, 1), loc='upper left')
-                plt.grid(True, linestyle='--', alpha=0.7)
-                st.pyplot(plt.gcf())
-                st.write(
-                    "- **Company Value Perception**: Market Cap divided by Stockholders Equity, indicating how the market values the company relative to its book value."
-                )
-                plt.clf()
-
-                # Graph 5: Scaled Research and Development
-                st.subheader("Research and Development (Percentage Change)")
-                plt.figure(figsize=(10, 4))
-                if "Research And Development" in scaleTicker.columns:
-                    plt.plot(scaleTicker.index, scaleTicker["Research And Development"], label="R&D", color='green')
-                plt.title(f"R&D Trends for {companyName}", fontsize=12)
-                plt.xlabel("Date", fontsize=10)
-                plt.ylabel("Percentage Change", fontsize=10)
-                plt.legend(title="Metrics", bbox_to_anchor=(1.05, 1), loc='upper left')
-                plt.grid(True, linestyle='--', alpha=0.7)
-                st.pyplot(plt.gcf())
-                st.write(
-                    "- **Research And Development**: Investment in innovation and future growth, showing commitment to new products or services."
-                )
-                plt.clf()
-                
-                # Display stock price trend
-                st.subheader("Stock Price Trend")
-                plt.figure(figsize=(10, 4))
-                plt.plot(stockPriceHistory.index, stockPriceHistory, label="Closing Price", color='blue')
-                plt.title(f"5-Year Stock Price History for {companyName}", fontsize=12)
-                plt.xlabel("Date", fontsize=10)
-                plt.ylabel("Stock Price (USD)", fontsize=10)
-                plt.legend(title="Price", bbox_to_anchor=(1.05, 1), loc='upper left')
-                plt.grid(True, linestyle='--', alpha=0.7)
-                st.pyplot(plt.gcf())
-                plt.clf()  # Clear the figure
-            
-            # # Competitor Analysis
-            # st.subheader("Competitor Analysis")
-            # st.write(competitors)
-            
-            # # Executive Team Report
-            # st.subheader("Executive Team")
-            # for exec in executives:
-            #     st.write(f"**{exec['name']}** - {exec['title']}")
-            
-            # # AI-Generated Insights
-            # st.subheader("AI Investment Insights")
-            # st.write(insights)
-            
-            # # Real-time News
-            # st.subheader("Latest News")
-            # for article in news:
-            #     st.write(f"[{article['title']}]({article['url']})")
-            
-            # # Stock Price Prediction
-            # st.subheader("Stock Price Prediction")
-            # st.write(f"Predicted Stock Price (based on trend analysis): ${predicted_price:.2f}")
+                with ThreadPoolExecutor(max_workers=len(PANELS) + 1) as executor:
+                    statements_future = executor.submit(fetch_financials, ticker)
+                    futures = {}
+                    for panel, (fetch, _, _) in PANELS.items():
+                        if panel in ("financials", "insights", "competitors"):
+                            futures[executor.submit(fetch, ticker, statements_future)] = panel
+                        else:
+                            futures[executor.submit(fetch, ticker)] = panel
+
+                    # Streaming the AI answer holds the script thread until the last token,
+                    # so it waits until every other panel has rendered
+                    pendingStream = None
+                    for future in as_completed(futures):
+                        panel = futures[future]
+                        try:
+                            result = future.result()
+                        except FinancialsUnavailable:
+                            continue
+                        except Exception as e:
+                            with slots[panel]:
+                                st.error(f"Error: Could not load {panel} for '{ticker}': {str(e)}")
+                            continue
+                        if panel == "insights" and not isinstance(result[0], str):
+                            pendingStream = result
+                            continue
+                        show_panel(slots[panel], panel, result, ticker)
+
+                    if pendingStream is not None:
+                        show_panel(slots["insights"], "insights", pendingStream, ticker)
         else:
             st.error("Please enter a valid stock ticker.")
 
@@ -1,11 +1,10 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 import zipfile
 import io
+from disk_cache import disk_cached
 
 def percentIncrease(df):
     dfPercents = {}
@@ -23,8 +22,30 @@ def percentIncrease(df):
     dfPercents = pd.DataFrame(data=dfPercents, index=df.index)
     return dfPercents
 
-# Function to fetch financial data including dividends and debt
+# Cache lifetimes: statement data for a day, closing prices for 30 minutes
+FINANCIALS_TTL = 24 * 60 * 60
+PRICE_TTL = 30 * 60
+
+# Function to fetch the 5-year closing price history
+@disk_cached("price_history", PRICE_TTL)
+def get_price_history(ticker):
+    import yfinance as yf
+    return yf.Ticker(ticker).history(period="5y")["Close"]
+
+# Function to fetch financial data including dividends and debt, with fresh price history
 def get_financials(ticker):
+    result = fetch_financials(ticker)
+    if result[0] is None:
+        return result
+    try:
+        return result[:2] + [get_price_history(ticker)] + result[3:]
+    except Exception as e:
+        return [None, None, None, f"Error: An unexpected issue occurred with '{ticker}': {str(e)}", None, str(e)]
+
+# Function to fetch the statement data, dividends and debt
+@disk_cached("analyzer_financials", FINANCIALS_TTL, keep=lambda result: result[0] is not None)
+def fetch_financials(ticker):
+    import yfinance as yf
     try:
         stock = yf.Ticker(ticker)
         financials = stock.financials
@@ -46,7 +67,6 @@ def get_financials(ticker):
 
         # Dividend data
         dividends = stock.dividends
-        stock_price_history = stock.history(period="5y")["Close"]
         dividend_yield = []
         if not dividends.empty:
             for date in ordinary_shares.index:
@@ -132,7 +152,7 @@ def get_financials(ticker):
         df_ticker.dropna(inplace=True, thresh=len(df_ticker.columns)-2)
         scale_ticker = percentIncrease(df_ticker)
 
-        return [financials_data, scale_ticker, stock_price_history, stock.info['longName'], df_ticker, None]
+        return [financials_data, scale_ticker, None, stock.info['longName'], df_ticker, None]
     
     except Exception as e:
         return [None, None, None, f"Error: An unexpected issue occurred with '{ticker}': {str(e)}", None, str(e)]
@@ -144,6 +164,7 @@ def main():
     
     if st.button("Analyze Stocks"):
         if ticker_input:
+            import matplotlib.pyplot as plt
             tickers = [t.strip().upper() for t in ticker_input.split(",")]
             current_date = datetime.now().strftime("%Y-%m-%d")
             zip_buffer = io.BytesIO()